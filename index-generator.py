@@ -318,6 +318,10 @@ let currentLang = '{lang}';
 let searchTimeout = null;
 const SEARCH_DELAY = 300; 
 
+// Cache des résultats de recherche (clé: requête, portée, plage de dates, fuzzy)
+const QUERY_CACHE_SIZE = 50;
+const queryCache = new Map();
+
 function changeLanguage(newLang) {{
     if (!ALL_LOCALIZATION_DATA[newLang]) return;
 
@@ -421,6 +425,8 @@ function initializeTable() {{
             }}
         }}
     }}
+    // Les résultats calculés avant le parsing des messages ne sont plus valides
+    queryCache.clear();
 }}
 window.addEventListener('load', initializeTable);
 
@@ -470,6 +476,94 @@ function dateToTimestamp(dateString) {{
     return dt.getTime() / 1000; 
 }}
 
+// --- Moteur de requêtes: cache borné et raffinement incrémental ---
+
+function textMatches(text, filter, isFuzzy) {{
+    return isFuzzy ? fuzzyMatch(text, filter) : text.indexOf(filter) > -1;
+}}
+
+function getQueryOptionsKey(query) {{
+    return JSON.stringify([query.scopeName, query.scopeMessage, query.tsStart, query.tsEnd, query.isFuzzy]);
+}}
+
+function cacheQueryResult(key, entry) {{
+    // Ordre d'insertion de la Map = ordre LRU: on réinsère l'entrée en fin de liste
+    queryCache.delete(key);
+    queryCache.set(key, entry);
+    if (queryCache.size > QUERY_CACHE_SIZE) {{
+        queryCache.delete(queryCache.keys().next().value);
+    }}
+}}
+
+function findRefinableEntry(query, optionsKey) {{
+    // Le raffinement n'est sûr que si la correspondance est monotone: une sous-chaîne
+    // exacte. La distance de Levenshtein (fuzzy, filtre >= 4 caractères) ne l'est pas.
+    if (query.filter.length === 0) return null;
+    if (query.isFuzzy && query.filter.length >= 4) return null;
+
+    let best = null;
+    for (const entry of queryCache.values()) {{
+        if (entry.optionsKey !== optionsKey) continue;
+        if (entry.filter.length === 0 || entry.filter.length >= query.filter.length) continue;
+        if (query.filter.indexOf(entry.filter) === -1) continue;
+        if (!best || entry.filter.length > best.filter.length) best = entry;
+    }}
+    return best;
+}}
+
+function runQuery(query) {{
+    const optionsKey = getQueryOptionsKey(query);
+    const key = JSON.stringify([query.filter, optionsKey]);
+
+    const cached = queryCache.get(key);
+    if (cached) {{
+        cacheQueryResult(key, cached);
+        return cached.results;
+    }}
+
+    const results = new Map();
+    const base = findRefinableEntry(query, optionsKey);
+
+    if (base) {{
+        // Raffinement: on ne re-teste que les lignes et messages retenus par la requête précédente
+        for (const [tr_element, previous] of base.results) {{
+            const name_match = query.scopeName && textMatches(tr_element.getAttribute('data-contact-search'), query.filter, query.isFuzzy);
+            const message_indices = previous.messageIndices.filter(
+                idx => textMatches(tr_element.messagesData[idx].text, query.filter, query.isFuzzy)
+            );
+            if (name_match || message_indices.length > 0) {{
+                results.set(tr_element, {{ nameMatch: name_match, messageIndices: message_indices }});
+            }}
+        }}
+    }} else {{
+        const rows = document.querySelectorAll('#contactsTable tr[data-contact-search]');
+        for (const tr_element of rows) {{
+            const last_contact_timestamp = parseFloat(tr_element.querySelector('[data-timestamp]').getAttribute('data-timestamp'));
+            if (query.tsStart !== null && last_contact_timestamp < query.tsStart) continue;
+            if (query.tsEnd !== null && last_contact_timestamp >= query.tsEnd) continue;
+
+            if (query.filter.length === 0) {{
+                results.set(tr_element, {{ nameMatch: false, messageIndices: [] }});
+                continue;
+            }}
+
+            const name_match = query.scopeName && textMatches(tr_element.getAttribute('data-contact-search'), query.filter, query.isFuzzy);
+            const message_indices = [];
+            if (query.scopeMessage && tr_element.messagesData) {{
+                tr_element.messagesData.forEach((message, idx) => {{
+                    if (textMatches(message.text, query.filter, query.isFuzzy)) message_indices.push(idx);
+                }});
+            }}
+            if (name_match || message_indices.length > 0) {{
+                results.set(tr_element, {{ nameMatch: name_match, messageIndices: message_indices }});
+            }}
+        }}
+    }}
+
+    cacheQueryResult(key, {{ filter: query.filter, optionsKey: optionsKey, results: results }});
+    return results;
+}}
+
 function filterTable() {{ 
     const texts = ALL_LOCALIZATION_DATA[currentLang]; // Traduction dynamique
     const input = document.getElementById('search-input');
@@ -511,120 +605,86 @@ function filterTable() {{
         return;
     }}
 
+    // 1. FILTRAGE (date + recherche textuelle) via le moteur de requêtes
+    const results = runQuery({{
+        filter: filter,
+        scopeName: scopeName,
+        scopeMessage: scopeMessage,
+        tsStart: tsStart,
+        tsEnd: tsEnd,
+        isFuzzy: isFuzzyEnabled
+    }});
 
+    // 2. RENDU DES RÉSULTATS
     for (let i = 0; i < tr.length; i++) {{ 
         const tr_element = tr[i];
         const preview_div = tr_element.querySelector('.search-preview');
         if (!preview_div) continue; 
 
-        const contact_name = tr_element.getAttribute('data-contact-search');
-        const last_contact_timestamp = parseFloat(tr_element.querySelector('[data-timestamp]').getAttribute('data-timestamp'));
-
-        // 1. FILTRAGE PAR DATE 
-        let is_date_match = true;
-        if (tsStart !== null && last_contact_timestamp < tsStart) {{ is_date_match = false; }}
-        if (tsEnd !== null && last_contact_timestamp >= tsEnd) {{ is_date_match = false; }}
-
-        if (!is_date_match) {{
-            tr_element.style.display = "none";
-            continue;
-        }}
-
-        // 2. FILTRAGE PAR RECHERCHE TEXTUELLE
-        let is_text_match = false;
         preview_div.innerHTML = ''; 
 
-        // ... (Recherche dans le nom du contact inchangée)
         const contact_td = tr_element.children[0];
         const contact_link = contact_td.querySelector('a');
         const original_name = contact_td.getAttribute('data-original-name');
         contact_link.innerHTML = original_name; 
 
-        if (filter.length > 0 && scopeName) {{ 
-            let name_match = false;
-            if (isFuzzyEnabled) {{
-                 name_match = fuzzyMatch(contact_name, filter);
-            }} else {{
-                name_match = contact_name.indexOf(filter) > -1;
-            }}
-            
-            if (name_match) {{ 
-                is_text_match = true;
-
-                const regex = new RegExp(filter, 'gi'); 
-                const highlighted_name = original_name.replace(regex, (match) => '<strong>' + match + '</strong>');
-                contact_link.innerHTML = highlighted_name;
-            }}
+        const match = results.get(tr_element);
+        if (!match) {{
+            tr_element.style.display = "none";
+            continue;
         }}
 
-        // 2.2 Recherche dans le contenu des messages
-        const message_matches = []; 
+        // 2.1 Surlignage du nom du contact
+        if (match.nameMatch) {{ 
+            const regex = new RegExp(filter, 'gi'); 
+            const highlighted_name = original_name.replace(regex, (match) => '<strong>' + match + '</strong>');
+            contact_link.innerHTML = highlighted_name;
+        }}
 
-        if (filter.length > 0 && scopeMessage && tr_element.messagesData) {{ 
+        // 2.2 Aperçu des messages correspondants
+        if (match.messageIndices.length > 0) {{ 
             const SNIPPET_LENGTH = 50;
             const regex = new RegExp(filter, 'gi'); 
+            const message_matches = []; 
 
-            for (const message of tr_element.messagesData) {{ 
+            for (const idx of match.messageIndices) {{ 
+                const message = tr_element.messagesData[idx];
                 const message_text = message.text;
+                const match_index = message_text.indexOf(filter);
                 
-                let text_match = false;
-                if (isFuzzyEnabled) {{
-                    text_match = fuzzyMatch(message_text, filter);
-                }} else {{
-                    text_match = message_text.indexOf(filter) > -1;
-                }}
+                let final_html;
                 
-                if (text_match) {{ 
-                    is_text_match = true; 
-                    
-                    const match_index = message_text.indexOf(filter);
-                    
-                    let final_html;
+                if (match_index > -1) {{
+                    // Match exact
+                    const start_index = Math.max(0, match_index - SNIPPET_LENGTH);
+                    const end_index = Math.min(message_text.length, match_index + filter.length + SNIPPET_LENGTH);
+
+                    let snippet = message_text.substring(start_index, end_index);
+                    const highlighted_snippet = snippet.replace(regex, (match) => '<strong>' + match + '</strong>');
                     
-                    if (match_index > -1) {{
-                        // Match exact
-                        const start_index = Math.max(0, match_index - SNIPPET_LENGTH);
-                        const end_index = Math.min(message_text.length, match_index + filter.length + SNIPPET_LENGTH);
-
-                        let snippet = message_text.substring(start_index, end_index);
-                        const highlighted_snippet = snippet.replace(regex, (match) => '<strong>' + match + '</strong>');
-                        
-                        let final_snippet = highlighted_snippet;
-                        if (start_index > 0) final_snippet = '... ' + final_snippet;
-                        if (end_index < message_text.length) final_snippet = final_snippet + ' ...';
-
-                        final_html = '<span class="preview-date">' + message.date + '</span>' + final_snippet;
-                        
-                    }} else {{
-                         // Match fuzzy (Traduction dynamique du label "Fuzzy")
-                         final_html = '<span class="preview-date">' + message.date + texts.search_fuzzy + '</span>' + message_text.substring(0, 100) + '...';
-                    }}
+                    let final_snippet = highlighted_snippet;
+                    if (start_index > 0) final_snippet = '... ' + final_snippet;
+                    if (end_index < message_text.length) final_snippet = final_snippet + ' ...';
+
+                    final_html = '<span class="preview-date">' + message.date + '</span>' + final_snippet;
                     
-                    message_matches.push({{ html: final_html, timestamp: message.ts }});
+                }} else {{
+                     // Match fuzzy (Traduction dynamique du label "Fuzzy")
+                     final_html = '<span class="preview-date">' + message.date + texts.search_fuzzy + '</span>' + message_text.substring(0, 100) + '...';
                 }}
+                
+                message_matches.push({{ html: final_html, timestamp: message.ts }});
             }}
 
             // Trie les résultats du plus récent au plus ancien
             message_matches.sort((a, b) => b.timestamp - a.timestamp);
 
-            if (message_matches.length > 0) {{ 
-                const snippets_html = message_matches.map(m => m.html).join('<div class="snippet-separator"></div>');
-                preview_div.innerHTML = snippets_html;
-            }}
+            const snippets_html = message_matches.map(m => m.html).join('<div class="snippet-separator"></div>');
+            preview_div.innerHTML = snippets_html;
         }}
         
-        // 3. Affichage/Masquage de la ligne
-        if (tr_element.hasAttribute('data-contact-search')) {{ 
-            const is_text_filter_active = filter.length > 0;
-            
-            const should_display = is_date_match && (!is_text_filter_active || is_text_match);
-            
-            if (should_display) {{ 
-                tr_element.style.display = "";
-            }} else {{ 
-                tr_element.style.display = "none";
-            }}
-        }}
+        // 3. Affichage de la ligne
+        tr_element.style.display = "";
     }}
 }}
 </script>